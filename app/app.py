@@ -29,7 +29,8 @@ for _candidate in (_HERE, os.path.dirname(_HERE)):
 import gradio as gr
 from dotenv import load_dotenv
 
-from trawl import llm
+from trawl import warm
+from trawl.session import Session
 
 # Suppress Gradio 5→6 migration warnings (theme/css stay in Blocks for Modal compat)
 warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*Gradio 6")
@@ -49,6 +50,7 @@ EXAMPLE_PROMPTS = [
 
 _SESSION_ID = str(uuid.uuid4())[:8]
 _LOG_DIR: str | None = None
+_LOG_FILE = "tendertrawl_logs.jsonl"
 
 
 def _log_event(event: dict) -> None:
@@ -56,7 +58,7 @@ def _log_event(event: dict) -> None:
         return
     try:
         os.makedirs(_LOG_DIR, exist_ok=True)
-        log_path = os.path.join(_LOG_DIR, "tendertrawl_logs.jsonl")
+        log_path = os.path.join(_LOG_DIR, _LOG_FILE)
         with open(log_path, "a") as f:
             f.write(json.dumps({**event, "session": _SESSION_ID}) + "\n")
     except Exception:
@@ -67,30 +69,41 @@ def _log_event(event: dict) -> None:
 # Chat handler
 # ---------------------------------------------------------------------------
 
-def respond(message: str, history: list):
+def respond(message: str, history: list, session: Session | None = None):
+    session = session or Session()
     if not message.strip():
-        yield history, "", gr.update()
+        yield history, "", gr.update(), session
         return
 
     history = list(history) + [{"role": "user", "content": message.strip()}]
-    yield history, "", gr.update(visible=False)
+    yield history, "", gr.update(visible=False), session
 
-    # Status: casting
-    history = history + [{"role": "assistant", "content": "🎣 Casting the net..."}]
-    yield history, "", gr.update(visible=False)
-    time.sleep(0.7)
+    # Follow-ups that only narrow the last answer are served locally — no status theatre
+    refinement = session.refinement(message.strip())
 
-    # Status: checking catch
-    history[-1]["content"] = "🎣 Casting the net...\n\n💰 Checking the catch..."
-    yield history, "", gr.update(visible=False)
-    time.sleep(0.5)
+    if refinement is None:
+        # Status: casting
+        history = history + [{"role": "assistant", "content": "🎣 Casting the net..."}]
+        yield history, "", gr.update(visible=False), session
+        time.sleep(0.7)
+
+        # Status: checking catch
+        history[-1]["content"] = "🎣 Casting the net...\n\n💰 Checking the catch..."
+        yield history, "", gr.update(visible=False), session
+        time.sleep(0.5)
+    else:
+        history = history + [{"role": "assistant", "content": "💰 Checking the catch..."}]
+        yield history, "", gr.update(visible=False), session
 
     try:
-        full_response, has_tenders = llm.generate_response(message.strip())
+        full_response, has_tenders, path = session.answer(message.strip(), refinement)
         _log_event({
             "ts": datetime.now(timezone.utc).isoformat(),
             "event": "query",
             "query": message.strip(),
+            "path": path,
+            "keywords": (session.profile or {}).get("keywords", []) if path == "llm" else [],
+            "profile_source": (session.profile or {}).get("source") if path == "llm" else None,
             "has_tenders": has_tenders,
             "response_chars": len(full_response),
         })
@@ -112,11 +125,29 @@ def respond(message: str, history: list):
         accumulated += word + " "
         history[-1]["content"] = accumulated.rstrip()
         if i % 4 == 0:
-            yield history, "", gr.update(visible=False)
+            yield history, "", gr.update(visible=False), session
             time.sleep(0.018)
 
     history[-1]["content"] = accumulated.rstrip()
-    yield history, "", gr.update(visible=has_tenders)
+    yield history, "", gr.update(visible=has_tenders), session
+
+
+def _suggest_names(session: Session | None, key_up: gr.KeyUpData):
+    """
+    Autocomplete agencies / suppliers as the user types, ranked by spend —
+    limited to names in the current answer once there is one.
+    """
+    return gr.update(choices=(session or Session()).suggest(key_up.input_value, limit=10))
+
+
+def _narrow_to(name: str | None, session: Session | None) -> str:
+    """Send a picked agency/supplier as a follow-up — only once there's an answer to narrow."""
+    if not name:
+        return ""
+    if session is None or not session.categories:
+        gr.Info("Describe your business first — then narrow the results by agency or supplier.")
+        return ""
+    return name
 
 
 def _draft_clicked():
@@ -146,10 +177,20 @@ HEADER = """\
 """
 
 
-def create_demo(log_dir: str | None = None) -> gr.Blocks:
+def create_demo(log_dir: str | None = None, warm_interval: float | None = None) -> gr.Blocks:
     global _LOG_DIR
     _LOG_DIR = log_dir
 
+    # Serve popular queries hot from the first request: render insights for the
+    # most frequent logged keyword sets and fetch profiles for the example prompts
+    # plus the top logged queries.
+    warm.start(
+        os.path.join(log_dir, _LOG_FILE) if log_dir else "",
+        seed_queries=EXAMPLE_PROMPTS,
+        fetch_profiles=5,
+        interval=warm_interval,
+    )
+
     with gr.Blocks(
         title="TenderTrawl",
         theme=gr.themes.Monochrome(),
@@ -187,6 +228,14 @@ def create_demo(log_dir: str | None = None) -> gr.Blocks:
             show_share_button=False,
         )
 
+        narrow = gr.Dropdown(
+            choices=[],
+            value=None,
+            label="🔎 Narrow by agency or supplier",
+            allow_custom_value=True,
+            filterable=True,
+        )
+
         draft_btn = gr.Button(
             "📝 Draft a tender response →",
             visible=False,
@@ -194,8 +243,10 @@ def create_demo(log_dir: str | None = None) -> gr.Blocks:
             variant="secondary",
         )
 
+        session = gr.State(None)
+
         gr.ClearButton(
-            components=[msg, chatbot],
+            components=[msg, chatbot, session],
             value="Clear",
             size="sm",
             variant="secondary",
@@ -206,8 +257,12 @@ def create_demo(log_dir: str | None = None) -> gr.Blocks:
             "Prototype by [mmetrics.ai](https://mmetrics.ai)_",
         )
 
-        msg.submit(respond, [msg, chatbot], [chatbot, msg, draft_btn])
-        btn.click(respond, [msg, chatbot], [chatbot, msg, draft_btn])
+        msg.submit(respond, [msg, chatbot, session], [chatbot, msg, draft_btn, session])
+        btn.click(respond, [msg, chatbot, session], [chatbot, msg, draft_btn, session])
+        narrow.key_up(_suggest_names, [session], [narrow], show_progress="hidden", trigger_mode="always_last")
+        narrow.select(_narrow_to, [narrow, session], [msg]).then(
+            respond, [msg, chatbot, session], [chatbot, msg, draft_btn, session]
+        )
         draft_btn.click(_draft_clicked, [], [])
 
     return demo
@@ -13,6 +13,8 @@ Requires the 'gemini-secret' Modal secret to exist with GEMINI_API_KEY set.
 Check with: modal secret list
 """
 
+import os
+
 import modal
 
 app = modal.App("tendertrawl")
@@ -37,6 +39,10 @@ image = (
     .add_local_file("data/cn_combined.csv", "/root/data/cn_combined.csv")
 )
 
+# Open-tender index is optional — without it tenders come from Gemini Search
+if os.path.exists("data/atm_open.csv"):
+    image = image.add_local_file("data/atm_open.csv", "/root/data/atm_open.csv")
+
 
 @app.function(
     image=image,
@@ -52,5 +58,16 @@ def web():
     from fastapi import FastAPI
     from gradio.routes import mount_gradio_app
     from app import create_demo
-    demo = create_demo(log_dir="/root/logs")
-    return mount_gradio_app(app=FastAPI(), blocks=demo, path="/")
+    from trawl import insights
+
+    api = FastAPI()
+
+    @api.get("/api/suggest")
+    def suggest(q: str, kind: str | None = None, limit: int = 8):
+        """Autocomplete agencies / suppliers / categories, ranked by spend."""
+        kinds = [kind] if kind else None
+        return insights.suggest(q, kinds=kinds, limit=max(1, min(limit, 50)))
+
+    # Re-warm hourly so the cache follows what people are actually asking
+    demo = create_demo(log_dir="/root/logs", warm_interval=3600)
+    return mount_gradio_app(app=api, blocks=demo, path="/")
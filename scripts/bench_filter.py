@@ -0,0 +1,102 @@
+"""
+bench_filter.py — Benchmark date-bounded category filtering.
+
+Compares insights._filter() on the full cached dataset (publish-sorted
+searchsorted slices, financial-year End Date pruning) against a plain scan
+(category code mask + date masks over every row) on synthetic data, for the
+windows the app actually asks for, and checks both return the same rows.
+
+Usage:
+    python scripts/bench_filter.py
+    python scripts/bench_filter.py --rows 81000 1000000 --years 1 12
+"""
+
+import argparse
+import functools
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from loadtest import synthetic_contracts  # noqa: E402
+from trawl import insights  # noqa: E402
+
+
+def scan(df: pd.DataFrame, categories, since=None, until=None, ending_from=None, ending_to=None):
+    """The baseline: one mask over every row."""
+    mask = insights._category_mask(insights._codes("Category")[0], categories)
+    for col, lo, hi in (("Publish Date", since, until), ("End Date", ending_from, ending_to)):
+        if lo is not None:
+            mask &= (df[col] >= lo).to_numpy()
+        if hi is not None:
+            mask &= (df[col] <= hi).to_numpy()
+    return df[mask]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _use(df: pd.DataFrame) -> None:
+    """Point insights at `df` as if it were the loaded dataset, with fresh caches."""
+    insights.load = functools.lru_cache(maxsize=1)(lambda: df)
+    for cached in (insights._codes, insights._dates, insights._publish_order, insights.partitions):
+        cached.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark date-bounded category filtering.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[81_000, 1_000_000])
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 12],
+                        help="publish span of each dataset (paired with --rows)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 84)
+    print("🐟 FILTER BENCHMARK  (best of {}, ms)".format(args.repeat))
+    print("=" * 84)
+    print(f"  {'rows':>10} {'years':>5}  {'window':<26} {'parts':>5} {'scan':>8} {'pruned':>8} {'speedup':>8}  same")
+
+    for rows, years in zip(args.rows, args.years):
+        df = insights._prepare(synthetic_contracts(rows, years=years))
+        _use(df)
+        insights.partitions()  # built once at warm-up in the app
+
+        now = pd.Timestamp.now().normalize()
+        fy_end = now.year + (now.month >= 7)
+        cats = sorted(df["Category"].unique())
+        windows = {
+            f"FY{fy_end % 100} since/until": dict(since=pd.Timestamp(fy_end - 1, 7, 1),
+                                                  until=pd.Timestamp(fy_end, 6, 30, 23, 59, 59)),
+            "since 3 months ago": dict(since=now - pd.DateOffset(months=3)),
+            "expiring in 6 months": dict(ending_from=now, ending_to=now + pd.DateOffset(months=6)),
+            "past year + expiring": dict(since=now - pd.DateOffset(months=12),
+                                         ending_from=now, ending_to=now + pd.DateOffset(months=6)),
+        }
+
+        for scope, chosen in (("all cats", cats), ("10 cats", cats[:10])):
+            for name, bounds in windows.items():
+                expected = scan(df, chosen, **bounds)
+                result = insights._filter(df, chosen, **bounds)
+                t_scan = _best_of(lambda: scan(df, chosen, **bounds), args.repeat)
+                t_pruned = _best_of(lambda: insights._filter(df, chosen, **bounds), args.repeat)
+                print(
+                    f"  {rows:>10,} {years:>5g}  {(name + ', ' + scope):<26.26} {len(insights.partitions()):>5} "
+                    f"{t_scan * 1000:>8.2f} {t_pruned * 1000:>8.2f} {t_scan / t_pruned:>7.1f}×  "
+                    f"{'✓' if result.index.equals(expected.index) else '✗'}"
+                )
+
+    print("=" * 84)
+
+
+if __name__ == "__main__":
+    main()
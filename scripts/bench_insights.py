@@ -0,0 +1,100 @@
+"""
+bench_insights.py — Benchmark the agency/supplier top-k aggregation.
+
+Compares the original pandas path (groupby → agg → reset_index → full
+sort_values → head) against the integer-code kernel in trawl/insights.py
+(np.bincount + np.argpartition) on synthetic data, and checks both return
+the same top rows. The pandas path is timed twice: on the plain object-string
+frame (the old load()) and on the categorical frame load() now builds, so
+the kernel's own gain is separate from what categoricals alone buy.
+
+Usage:
+    python scripts/bench_insights.py
+    python scripts/bench_insights.py --rows 100000 1000000 3000000 --suppliers 24000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from loadtest import synthetic_contracts  # noqa: E402
+from trawl import insights  # noqa: E402
+
+
+def pandas_top(subset: pd.DataFrame, column: str, top_n: int) -> pd.DataFrame:
+    """The pre-kernel implementation, kept here as the baseline."""
+    return (
+        subset.groupby(column, observed=True)
+        .agg(total_value=("Value", "sum"), contract_count=("CN ID", "count"))
+        .reset_index()
+        .sort_values("total_value", ascending=False)
+        .head(top_n)
+    )
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame, column: str) -> bool:
+    return (
+        list(a[column].astype(str)) == list(b[column].astype(str))
+        and np.allclose(a["total_value"].to_numpy(float), b["total_value"].to_numpy(float))
+        and list(a["contract_count"].astype(int)) == list(b["contract_count"].astype(int))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark top-k agency/supplier aggregation.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--suppliers", type=int, default=24_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("=" * 100)
+    print("🐟 TOP-K AGGREGATION BENCHMARK  (best of {}, ms; speedup = kernel vs each pandas path)".format(args.repeat))
+    print("=" * 100)
+    print(
+        f"  {'rows':>10}  {'scope':<10} {'column':<14} {'groups':>7} {'pd plain':>9} {'pd categ':>9} "
+        f"{'kernel':>9} {'vs plain':>9} {'vs categ':>9}  same"
+    )
+
+    for rows in args.rows:
+        df = synthetic_contracts(rows, suppliers=args.suppliers)
+        coded = insights._prepare(df.copy())
+        cats = sorted(df["Category"].unique())
+        scopes = {"all": cats, "10 cats": cats[:10]}
+
+        for scope, chosen in scopes.items():
+            plain_subset = df[df["Category"].isin(chosen)]
+            coded_subset = coded[coded["Category"].isin(chosen)]
+            for column, top_n in (("Agency", 8), ("Supplier Name", 5)):
+                baseline = pandas_top(plain_subset, column, top_n)
+                result = insights._top_k(coded_subset, column, top_n)
+                t_pd = _best_of(lambda: pandas_top(plain_subset, column, top_n), args.repeat)
+                t_cat = _best_of(lambda: pandas_top(coded_subset, column, top_n), args.repeat)
+                t_k = _best_of(lambda: insights._top_k(coded_subset, column, top_n), args.repeat)
+                print(
+                    f"  {rows:>10,}  {scope:<10} {column:<14} {plain_subset[column].nunique():>7,} "
+                    f"{t_pd * 1000:>9.2f} {t_cat * 1000:>9.2f} {t_k * 1000:>9.2f} "
+                    f"{t_pd / t_k:>8.1f}× {t_cat / t_k:>8.1f}×  "
+                    f"{'✓' if _same(baseline, result, column) else '✗'}"
+                )
+
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+combine_atm_exports.py — Concatenate AusTender Approach to Market (ATM) exports.
+
+Drop open-ATM .xlsx/.csv exports into data/raw/atm/. The header row is found
+by looking for the "ATM ID" column (exports carry a few metadata rows above it).
+Outputs a single cleaned CSV of currently open tenders to data/atm_open.csv.
+
+Usage:
+    python scripts/combine_atm_exports.py
+"""
+
+import glob
+import os
+import sys
+
+import pandas as pd
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "raw", "atm")
+OUT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "atm_open.csv")
+
+# Export column name variants → canonical names used by trawl/tenders.py
+COLUMN_ALIASES = {
+    "ATM ID": ["ATM ID", "ATM Id", "ATMID"],
+    "Title": ["Title", "ATM Title"],
+    "Agency": ["Agency", "Agency Name"],
+    "Category": ["Category", "UNSPSC Title", "UNSPSC"],
+    "Description": ["Description", "ATM Description"],
+    "ATM Type": ["ATM Type", "Type"],
+    "Publish Date": ["Publish Date", "Published Date"],
+    "Close Date": ["Close Date", "Close Date & Time", "Closing Date", "Close Date/Time"],
+    "URL": ["URL", "Link", "ATM URL"],
+}
+
+
+def _find_header(raw: pd.DataFrame) -> int:
+    """Index of the first row containing an ATM ID column name."""
+    names = {n.lower() for n in COLUMN_ALIASES["ATM ID"]}
+    for i, row in raw.head(15).iterrows():
+        if any(str(v).strip().lower() in names for v in row.values):
+            return i
+    return 0
+
+
+def load_single(path: str) -> pd.DataFrame:
+    """Load one ATM export (xlsx or csv) with its header row auto-detected."""
+    try:
+        if path.endswith(".csv"):
+            raw = pd.read_csv(path, header=None, dtype=str)
+        else:
+            raw = pd.read_excel(path, header=None, dtype=str, engine="openpyxl")
+        header = _find_header(raw)
+        df = raw.iloc[header + 1:].copy()
+        df.columns = [str(c).strip() for c in raw.iloc[header]]
+        df = df.dropna(how="all")
+        print(f"  ✓ {os.path.basename(path)}: {len(df):,} rows, {len(df.columns)} cols")
+        return df
+    except Exception as e:
+        print(f"  ✗ {os.path.basename(path)}: FAILED — {e}")
+        return pd.DataFrame()
+
+
+def clean(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalise column names, parse dates, dedup, keep only still-open tenders."""
+    rename = {}
+    for canonical, variants in COLUMN_ALIASES.items():
+        for v in variants:
+            if v in df.columns and canonical not in rename.values():
+                rename[v] = canonical
+    df = df.rename(columns=rename)
+    df = df[[c for c in COLUMN_ALIASES if c in df.columns]].copy()
+
+    missing = {"ATM ID", "Title", "Close Date"} - set(df.columns)
+    if missing:
+        print(f"\n  ⚠️  Missing required columns: {sorted(missing)}")
+        return pd.DataFrame(columns=list(COLUMN_ALIASES))
+
+    # --- Strip whitespace from string columns ---
+    for col in df.columns:
+        df[col] = df[col].astype("string").str.strip()
+
+    # --- Dedup by ATM ID (keep latest if re-exported) ---
+    before = len(df)
+    df = df.drop_duplicates(subset=["ATM ID"], keep="last")
+    print(f"\n  Deduped: {before:,} → {len(df):,} rows ({before - len(df):,} duplicates removed)")
+
+    # --- Parse date columns (Australian format: day first; close dates may carry a time) ---
+    for col in ["Publish Date", "Close Date"]:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], dayfirst=True, errors="coerce", format="mixed")
+
+    # --- Keep only tenders that haven't closed ---
+    now = pd.Timestamp.now()
+    open_mask = df["Close Date"] >= now
+    print(f"  Open: {open_mask.sum():,} of {len(df):,} (dropped {(~open_mask).sum():,} closed/undated)")
+    return df[open_mask].sort_values("Close Date")
+
+
+def summarise(df: pd.DataFrame) -> None:
+    """Print a summary of the open-tender index."""
+    print("\n" + "=" * 60)
+    print("🎣 OPEN TENDERS SUMMARY")
+    print("=" * 60)
+    print(f"  Open tenders:        {len(df):,}")
+    if len(df):
+        print(f"  Closing:             {df['Close Date'].min()} → {df['Close Date'].max()}")
+    if "Agency" in df.columns:
+        print(f"  Unique agencies:     {df['Agency'].nunique()}")
+    if "Category" in df.columns:
+        print(f"  Unique categories:   {df['Category'].nunique()}")
+    print("=" * 60)
+
+
+def main():
+    files = sorted(glob.glob(os.path.join(RAW_DIR, "*.xlsx")) + glob.glob(os.path.join(RAW_DIR, "*.csv")))
+    print(f"🐟 Found {len(files)} ATM export files in {RAW_DIR}\n")
+
+    if not files:
+        print("No files found! Drop open-ATM exports from tenders.gov.au into data/raw/atm/.")
+        sys.exit(1)
+
+    frames = [f for f in (load_single(p) for p in files) if not f.empty]
+    if not frames:
+        print("No data loaded from any file!")
+        sys.exit(1)
+
+    combined = pd.concat(frames, ignore_index=True)
+    print(f"\n  Combined: {len(combined):,} total rows from {len(frames)} files")
+
+    combined = clean(combined)
+
+    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
+    combined.to_csv(OUT_PATH, index=False)
+    print(f"\n  💾 Saved to {OUT_PATH}")
+
+    summarise(combined)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""
+loadtest.py — Offline load test for the chat pipeline.
+
+Swaps the Gemini client for an in-process stub (canned profile + tender
+responses, configurable latency and error rate) and drives N concurrent
+sessions through the same threadpool-behind-an-event-loop setup Gradio uses
+on Modal. Reports throughput, latency percentiles, pool saturation,
+event-loop lag and memory. No network, no API key.
+
+Usage:
+    python scripts/loadtest.py --sessions 100 --turns 3
+    python scripts/loadtest.py --sessions 50 --latency 8 --jitter 3 --error-rate 0.05
+    python scripts/loadtest.py --synthetic-rows 1000000 --target respond
+    python scripts/loadtest.py --cold   # skip the warm-up pass, measure first-hit cost
+
+Caches are warmed with the same pass the app runs at startup (trawl/warm.py)
+before timing starts, so percentiles reflect steady-state capacity.
+
+--target generate  drives llm.generate_response() (default)
+--target respond   drives app.respond(), including the status/streaming sleeps; each
+                   simulated session keeps one chat history + Session across turns, and
+                   later turns mix in narrowing follow-ups
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from trawl import insights, llm, warm  # noqa: E402
+
+QUERIES = [
+    "Health survey fieldwork — anthropometric screening and data collection",
+    "Environmental consulting — catchment modelling and water quality",
+    "International development program management — Southeast Asia",
+    "We're a small cybersecurity consultancy in Canberra, specialising in cloud migration and IRAP assessments.",
+    "Facilities maintenance and cleaning for office buildings",
+    "Software development and data analytics for health agencies",
+    "Legal services and policy advice",
+    "Training and recruitment services for government departments",
+]
+
+# Narrowing follow-ups mixed into later turns of --target respond chats
+FOLLOWUPS = [
+    "what about the next 12 months?",
+    "FY25 only",
+    "just defence",
+    "past 2 years",
+    "all agencies",
+]
+
+_TENDER_MD = """\
+🎣 Found **2 open tenders** that match your capabilities:
+
+---
+
+🎯 **[Stub tender — Department of Stubs](https://example.invalid/atm/1)**
+Closes **31 Dec 2026**
+*Canned response from the load-test stub*
+
+⚡ **[Another stub tender — Stub Agency](https://example.invalid/atm/2)**
+Closes **15 Jan 2027**
+*Canned response from the load-test stub*"""
+
+
+# ---------------------------------------------------------------------------
+# Stub Gemini client
+# ---------------------------------------------------------------------------
+
+class StubError(RuntimeError):
+    """Injected failure, stands in for a 429/503 from the real API."""
+
+
+class _StubModels:
+    def __init__(self, latency: float, jitter: float, error_rate: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def generate_content(self, model: str, contents: str, config=None):
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._rng.gauss(self.latency, self.jitter))
+            fail = self._rng.random() < self.error_rate
+        time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.errors += 1
+            raise StubError("503 UNAVAILABLE (stub)")
+
+        if "Return JSON ONLY" in contents:
+            return SimpleNamespace(text=self._profile_json(contents))
+        return SimpleNamespace(text=_TENDER_MD)
+
+    @staticmethod
+    def _profile_json(prompt: str) -> str:
+        # Echo the input's longer words back as keywords so category matching
+        # does realistic work downstream.
+        user_input = prompt.rsplit("Input:", 1)[-1]
+        words = [w.lower() for w in re.findall(r"[A-Za-z]{4,}", user_input)]
+        keywords = list(dict.fromkeys(words))[:10]
+        return "```json\n" + json.dumps({
+            "summary": user_input.strip()[:200],
+            "keywords": keywords,
+            "url": "",
+            "confidence": "medium",
+        }) + "\n```"
+
+
+class StubClient:
+    """Duck-typed stand-in for google.genai.Client (only .models.generate_content)."""
+
+    def __init__(self, latency: float = 2.0, jitter: float = 0.5, error_rate: float = 0.0, seed: int = 0):
+        self.models = _StubModels(latency, jitter, error_rate, seed)
+
+
+def install_stub(client: StubClient) -> None:
+    """Route every llm._client() call to the stub."""
+    llm._client = lambda: client
+
+
+# ---------------------------------------------------------------------------
+# Synthetic dataset (when data/cn_combined.csv isn't available)
+# ---------------------------------------------------------------------------
+
+_CATEGORY_WORDS = [
+    "Computer", "Security", "Cloud", "Software", "Engineering", "Health", "Medical",
+    "Environmental", "Water", "Legal", "Training", "Recruitment", "Cleaning",
+    "Building", "Construction", "Transport", "Research", "Survey", "Data",
+    "Management", "Development", "Program", "Consulting", "Policy",
+]
+
+
+def synthetic_contracts(
+    rows: int,
+    agencies: int = 127,
+    suppliers: int = 24_000,
+    categories: int = 551,
+    seed: int = 0,
+    years: float = 3,
+) -> pd.DataFrame:
+    """
+    Random contract notices with the columns the insights engine uses,
+    published over the last `years` years.
+    """
+    rng = np.random.default_rng(seed)
+    agency_names = np.array([f"Agency {i:03d}" for i in range(agencies)])
+    supplier_names = np.array([f"Supplier {i:05d} Pty Ltd" for i in range(suppliers)])
+    category_names = np.array([
+        f"{_CATEGORY_WORDS[i % len(_CATEGORY_WORDS)]} "
+        f"{_CATEGORY_WORDS[(i * 7 + 3) % len(_CATEGORY_WORDS)].lower()} services {i}"
+        for i in range(categories)
+    ])
+
+    # Skewed draws: a few agencies/suppliers take most of the work, like the real data
+    agency_idx = np.minimum(rng.zipf(1.3, rows) - 1, agencies - 1)
+    supplier_idx = np.minimum(rng.zipf(1.1, rows) - 1, suppliers - 1)
+    category_idx = rng.integers(0, categories, rows)
+
+    now = pd.Timestamp.now().normalize()
+    publish = now - pd.to_timedelta(rng.integers(0, max(int(365 * years), 1), rows), unit="D")
+    end = publish + pd.to_timedelta(rng.integers(30, 365 * 4, rows), unit="D")
+
+    return pd.DataFrame({
+        "CN ID": [f"CN{i:08d}" for i in range(rows)],
+        "Agency": agency_names[agency_idx],
+        "Supplier Name": supplier_names[supplier_idx],
+        "Category": category_names[category_idx],
+        "Description": category_names[category_idx],
+        "Value": np.round(rng.lognormal(11, 1.8, rows), 2),
+        "Publish Date": publish,
+        "End Date": end,
+    })
+
+
+# ---------------------------------------------------------------------------
+# Load driver
+# ---------------------------------------------------------------------------
+
+def _pct(sorted_vals: list[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, int(round(q / 100 * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+
+def _rss_mb() -> float:
+    """Current RSS in MB (Linux /proc), falling back to peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _make_call(target: str):
+    """
+    Return call(query, chat) for one turn. `chat` carries a simulated session's
+    history and Session between turns (unused by the generate target).
+    """
+    if target == "generate":
+        def call(query: str, chat: SimpleNamespace) -> None:
+            llm.generate_response(query)
+        return call
+
+    from app.app import respond  # gradio import; only needed for this target
+
+    def call(query: str, chat: SimpleNamespace) -> None:
+        for history, _, _, session in respond(query, chat.history, chat.session):
+            pass
+        chat.history, chat.session = history, session
+        # respond() turns exceptions into a ⚠️ chat message instead of raising
+        if history[-1]["content"].startswith("⚠️"):
+            raise RuntimeError(history[-1]["content"])
+    return call
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: list[float] = []
+        self.queue_waits: list[float] = []
+        self.failures = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.peak_threads = threading.active_count()
+        self.peak_rss = _rss_mb()
+        self.loop_lags: list[float] = []
+
+
+async def _session(sid: int, args, loop, pool, call, stats: _Stats) -> None:
+    rng = random.Random(args.seed + sid)
+    chat = SimpleNamespace(history=[], session=None)
+    for turn in range(args.turns):
+        if args.target == "respond" and turn and rng.random() < 0.5:
+            query = rng.choice(FOLLOWUPS)
+        else:
+            query = rng.choice(QUERIES)
+        submitted = time.perf_counter()
+
+        def work() -> None:
+            started = time.perf_counter()
+            with stats.lock:
+                stats.queue_waits.append(started - submitted)
+                stats.in_flight += 1
+                stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+            try:
+                call(query, chat)
+            except Exception:
+                with stats.lock:
+                    stats.failures += 1
+            finally:
+                with stats.lock:
+                    stats.in_flight -= 1
+
+        await loop.run_in_executor(pool, work)
+        with stats.lock:
+            stats.latencies.append(time.perf_counter() - submitted)
+        if args.think:
+            await asyncio.sleep(rng.uniform(0, args.think))
+
+
+async def _monitor(stats: _Stats, stop: asyncio.Event, interval: float = 0.05) -> None:
+    """Sample event-loop lag, thread count and RSS until stopped."""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        stats.loop_lags.append(max(0.0, time.perf_counter() - t0 - interval))
+        stats.peak_threads = max(stats.peak_threads, threading.active_count())
+        stats.peak_rss = max(stats.peak_rss, _rss_mb())
+
+
+async def run(args) -> tuple[_Stats, float]:
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="loadtest")
+    call = _make_call(args.target)
+    stats = _Stats()
+    stop = asyncio.Event()
+
+    monitor = asyncio.create_task(_monitor(stats, stop))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _session(i, args, loop, pool, call, stats) for i in range(args.sessions)
+    ))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await monitor
+    pool.shutdown(wait=True)
+    return stats, elapsed
+
+
+def report(args, stats: _Stats, elapsed: float, client: StubClient, rss_before: float) -> None:
+    lat = sorted(stats.latencies)
+    wait = sorted(stats.queue_waits)
+    lag = sorted(stats.loop_lags)
+    done = len(lat)
+
+    print("\n" + "=" * 60)
+    print("🐟 LOAD TEST")
+    print("=" * 60)
+    print(f"  Target:              {args.target}")
+    print(f"  Sessions × turns:    {args.sessions} × {args.turns}  ({done:,} requests)")
+    print(f"  Worker threads:      {args.workers}")
+    print(f"  Stub latency:        {args.latency:.2f}s ± {args.jitter:.2f}s, error rate {args.error_rate:.0%}")
+    print(f"  Stub calls/errors:   {client.models.calls:,} / {client.models.errors:,}")
+    print(f"\n  Wall time:           {elapsed:,.2f}s")
+    print(f"  Throughput:          {done / max(elapsed, 1e-9):,.2f} req/s")
+    print(f"  Failures:            {stats.failures:,} ({stats.failures / max(done, 1):.1%})")
+    print(f"\n  Latency p50/p90/p99: {_pct(lat, 50):.2f}s / {_pct(lat, 90):.2f}s / {_pct(lat, 99):.2f}s"
+          f"  (max {lat[-1] if lat else 0:.2f}s)")
+    print(f"  Queue wait p50/p99:  {_pct(wait, 50):.3f}s / {_pct(wait, 99):.3f}s")
+    print(f"  Peak in-flight:      {stats.peak_in_flight} / {args.workers} workers"
+          + ("  ⚠️  pool saturated" if stats.peak_in_flight >= args.workers else ""))
+    print(f"  Peak threads:        {stats.peak_threads}")
+    print(f"  Loop lag p99/max:    {_pct(lag, 99) * 1000:.1f}ms / {(lag[-1] if lag else 0) * 1000:.1f}ms")
+    print(f"  RSS before/peak:     {rss_before:,.0f}MB / {stats.peak_rss:,.0f}MB")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test with a stub Gemini client.")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=3, help="requests per session")
+    parser.add_argument("--workers", type=int, default=40,
+                        help="threadpool size (Gradio/AnyIO default is 40)")
+    parser.add_argument("--target", choices=["generate", "respond"], default="generate")
+    parser.add_argument("--latency", type=float, default=2.0, help="mean stub latency per LLM call (s)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="stub latency std dev (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub calls that raise")
+    parser.add_argument("--think", type=float, default=0.0, help="max random pause between turns (s)")
+    parser.add_argument("--synthetic-rows", type=int, default=0,
+                        help="use N synthetic contracts instead of data/cn_combined.csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cold", action="store_true",
+                        help="skip the startup warm-up pass (partitions, indexes, vocabulary)")
+    args = parser.parse_args()
+
+    if args.synthetic_rows or not os.path.exists(insights._DATA_PATH):
+        rows = args.synthetic_rows or 80_000
+        print(f"🐟 Generating {rows:,} synthetic contracts...")
+        df = insights._prepare(synthetic_contracts(rows, seed=args.seed))
+        insights.load = lambda: df
+    else:
+        print(f"🐟 Loading {insights._DATA_PATH}...")
+        insights.load()
+
+    client = StubClient(args.latency, args.jitter, args.error_rate, args.seed)
+    install_stub(client)
+
+    if not args.cold:
+        # Same pass the app runs at startup; no log and no profile fetches, so no stub calls
+        stats = warm.warm("")
+        print(f"🔥 Warmed caches in {stats['seconds']}s")
+
+    rss_before = _rss_mb()
+    stats, elapsed = asyncio.run(run(args))
+    report(args, stats, elapsed, client, rss_before)
+
+
+if __name__ == "__main__":
+    main()
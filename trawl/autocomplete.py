@@ -0,0 +1,115 @@
+"""
+trawl/autocomplete.py — Token prefix trie for name autocomplete.
+
+Every word of every name is inserted into a character trie. Entries are
+numbered in descending score order and each trie node keeps the ids that pass
+through it, so a node's id list is already ranked: a prefix lookup is a walk
+of len(prefix) nodes plus a scan from the front of one list.
+
+Multi-word queries ("dep def") match names where every query word prefixes
+some word of the name ("Department of Defence").
+
+Public API:
+    PrefixIndex(entries)            → build from (kind, name, total_value, contract_count)
+    PrefixIndex.search(query, ...)  → ranked matches as dicts, optionally filtered by where(kind, name)
+    PrefixIndex.exact(kind, name)   → case-insensitive exact lookup
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Iterable
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Prefixes longer than this share the deepest node; matches are verified per entry anyway
+_MAX_DEPTH = 12
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.ids: list[int] = []
+
+
+class PrefixIndex:
+    def __init__(self, entries: Iterable[tuple[str, str, float, int]]):
+        # Highest total first, so ids in every node list are in rank order
+        self._entries = sorted(entries, key=lambda e: -e[2])
+        self._tokens: list[tuple[str, ...]] = []
+        self._exact: dict[tuple[str, str], int] = {}
+        self._root = _Node()
+
+        for eid, (kind, name, _, _) in enumerate(self._entries):
+            tokens = tuple(dict.fromkeys(_tokenize(name)))
+            self._tokens.append(tokens)
+            self._exact.setdefault((kind, name.lower()), eid)
+            for tok in tokens:
+                self._insert(tok, eid)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, token: str, eid: int) -> None:
+        node = self._root
+        for ch in token[:_MAX_DEPTH]:
+            node = node.children.setdefault(ch, _Node())
+            # Two tokens of one name can share a prefix ("data", "database")
+            if not node.ids or node.ids[-1] != eid:
+                node.ids.append(eid)
+
+    def _ids(self, token: str) -> list[int]:
+        node = self._root
+        for ch in token[:_MAX_DEPTH]:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.ids
+
+    def _as_dict(self, eid: int) -> dict:
+        kind, name, total, count = self._entries[eid]
+        return {"kind": kind, "name": name, "total_value": float(total), "contract_count": int(count)}
+
+    def search(
+        self,
+        query: str,
+        kinds: Iterable[str] | None = None,
+        limit: int | None = 8,
+        where: Callable[[str, str], bool] | None = None,
+    ) -> list[dict]:
+        """
+        Names where every query word prefixes one of the name's words,
+        highest total first. `limit=None` returns every match. `where(kind,
+        name)` filters candidates in rank order, so the scan still stops at
+        `limit` and only kept matches are built.
+        """
+        tokens = _tokenize(query)
+        if not tokens:
+            return []
+        kinds = set(kinds) if kinds else None
+
+        candidates = min((self._ids(t) for t in tokens), key=len)
+        matches = []
+        for eid in candidates:
+            kind, name = self._entries[eid][:2]
+            if kinds and kind not in kinds:
+                continue
+            if where is not None and not where(kind, name):
+                continue
+            words = self._tokens[eid]
+            if all(any(w.startswith(t) for w in words) for t in tokens):
+                matches.append(self._as_dict(eid))
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def exact(self, kind: str, name: str) -> dict | None:
+        """Case-insensitive exact name lookup within one kind."""
+        eid = self._exact.get((kind, name.strip().lower()))
+        return self._as_dict(eid) if eid is not None else None
@@ -4,32 +4,102 @@ trawl/insights.py — Pandas queries over cn_combined.csv.
 Public API:
     load()                          → load + cache the dataset
     match_categories(keywords)      → find matching Category values
+    select(categories)              → rows in the given categories
     spend_by_agency(categories)     → top agencies by spend
     top_suppliers(categories)       → top winning suppliers
-    expiring_contracts(categories)  → contracts ending within 6 months
+    expiring_contracts(categories)  → contracts ending within N months (default 6)
     category_summary(categories)    → combined dict for LLM context
+    partitions()                    → cached Publish Date financial-year ranges
+    name_index()                    → cached prefix trie over agencies/suppliers/categories
+    suggest(prefix)                 → autocomplete, ranked by total spend
+    resolve_agency(name)            → exact Agency names for a typed name
+
+All query functions take optional `since` / `until` bounds on Publish Date
+(inclusive). On the full dataset a window is one slice of a publish-sorted
+row order, so only the rows inside it are read.
 """
 
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
+from trawl.autocomplete import PrefixIndex
+
 _DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cn_combined.csv")
 
+# Generic words that appear in almost every category name — matching on them
+# produces useless noise (e.g. "services" matches "Accounting services" etc.)
+STOPWORDS = {"services", "service", "solutions", "solution", "national",
+             "australian", "government", "support", "management", "operations"}
+
+
+# Stored as categoricals: Agency/Supplier codes feed the top-k kernels, and
+# CN ID's codes make its null check (for contract_count) an integer compare
+_CODED_COLUMNS = ("CN ID", "Agency", "Supplier Name")
+
 
 @lru_cache(maxsize=1)
 def load() -> pd.DataFrame:
     """Load cn_combined.csv once and cache in-process."""
     df = pd.read_csv(_DATA_PATH, low_memory=False, parse_dates=["End Date", "Publish Date"])
+    return _prepare(df)
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalise dtypes of a freshly loaded contract frame (in place)."""
     # Ensure Value is numeric
     df["Value"] = pd.to_numeric(df["Value"], errors="coerce")
+    for col in _CODED_COLUMNS:
+        df[col] = df[col].astype("category")
     return df
 
 
+def _top_k(subset: pd.DataFrame, column: str, top_n: int) -> pd.DataFrame:
+    """
+    Sum of Value and count of CN ID per `column` value, top `top_n` by sum.
+
+    Same result as groupby().agg().sort_values().head(), but works on integer
+    codes: np.bincount for the per-group sums/counts and np.argpartition to
+    pick the top groups, so only k rows are ever sorted.
+    """
+    col = subset[column]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes, labels = col.cat.codes.to_numpy(), col.cat.categories
+    else:
+        codes, labels = pd.factorize(col)
+
+    valid = codes >= 0
+    codes = codes[valid]
+    values = np.nan_to_num(subset["Value"].to_numpy(dtype=float, na_value=np.nan)[valid])
+    cn = subset["CN ID"]
+    if isinstance(cn.dtype, pd.CategoricalDtype):
+        counted = cn.cat.codes.to_numpy()[valid] >= 0
+    else:
+        counted = cn.notna().to_numpy()[valid]
+
+    n = len(labels)
+    totals = np.bincount(codes, weights=values, minlength=n)
+    counts = np.bincount(codes, weights=counted, minlength=n)
+    # Only groups present in this subset (categoricals carry every label)
+    groups = np.flatnonzero(np.bincount(codes, minlength=n))
+
+    if 0 < top_n < len(groups):
+        groups = groups[np.argpartition(-totals[groups], top_n - 1)[:top_n]]
+    groups = groups[np.argsort(-totals[groups], kind="stable")][:max(top_n, 0)]
+
+    return pd.DataFrame({
+        column: np.asarray(labels)[groups],
+        "total_value": totals[groups],
+        "contract_count": counts[groups].astype(int),
+    })
+
+
 def match_categories(keywords: list[str], df: pd.DataFrame | None = None) -> list[str]:
     """
     Return Category values from the dataset that contain any of the keywords
@@ -44,11 +114,6 @@ def match_categories(keywords: list[str], df: pd.DataFrame | None = None) -> lis
 
     cats = df["Category"].dropna().unique()
 
-    # Generic words that appear in almost every category name — matching on them
-    # produces useless noise (e.g. "services" matches "Accounting services" etc.)
-    _STOP = {"services", "service", "solutions", "solution", "national",
-             "australian", "government", "support", "management", "operations"}
-
     # Expand multi-word phrases into individual tokens for better matching
     # (LLM keywords like "cloud security" won't match "IaaS - Cloud" as a phrase)
     tokens: set[str] = set()
@@ -56,7 +121,7 @@ def match_categories(keywords: list[str], df: pd.DataFrame | None = None) -> lis
         kw_low = kw.lower()
         tokens.add(kw_low)
         for word in kw_low.split():
-            if len(word) > 3 and word not in _STOP:
+            if len(word) > 3 and word not in STOPWORDS:
                 tokens.add(word)
 
     matched = [
@@ -66,15 +131,296 @@ def match_categories(keywords: list[str], df: pd.DataFrame | None = None) -> lis
     return sorted(matched)
 
 
-def _filter(df: pd.DataFrame, categories: list[str]) -> pd.DataFrame:
-    """Return rows whose Category is in the given list."""
-    return df[df["Category"].isin(categories)]
+@dataclass(frozen=True)
+class Partition:
+    """One Publish Date financial year: a contiguous range of the publish-sorted row order."""
+    key: str                        # e.g. "FY2025"; "unknown" for missing Publish Date
+    start: int                      # [start, stop) into _publish_order().order
+    stop: int
+    publish_min: pd.Timestamp
+    publish_max: pd.Timestamp
+    end_min: pd.Timestamp           # End Date bounds, used for pruning only
+    end_max: pd.Timestamp
+
+
+@lru_cache(maxsize=None)
+def _codes(column: str) -> tuple[np.ndarray, pd.Index]:
+    """Integer-code a column of the loaded dataset: (codes, labels), -1 for missing."""
+    return pd.factorize(load()[column])
+
+
+@lru_cache(maxsize=None)
+def _dates(column: str) -> np.ndarray:
+    """A date column of the loaded dataset as datetime64 (NaT for missing)."""
+    return load()[column].to_numpy(dtype="datetime64[ns]")
+
+
+def _category_lookup(categories: list[str]) -> np.ndarray:
+    """Boolean table indexed by category code: True for `categories`, False for -1 (missing)."""
+    labels = _codes("Category")[1]
+    # One spare slot at the end so code -1 (missing) indexes a False
+    wanted = np.zeros(len(labels) + 1, dtype=bool)
+    idx = labels.get_indexer(categories)
+    wanted[idx[idx >= 0]] = True
+    return wanted
+
+
+def _category_mask(codes: np.ndarray, categories: list[str]) -> np.ndarray:
+    """Boolean row mask for `categories` via a lookup table over category codes."""
+    return _category_lookup(categories)[codes]
+
+
+@dataclass(frozen=True)
+class _PublishOrder:
+    """The loaded dataset's rows sorted by Publish Date, missing dates last."""
+    order: np.ndarray               # row positions in Publish Date order
+    publish: np.ndarray             # Publish Date, in that order
+    end: np.ndarray                 # End Date, in that order
+    category_codes: np.ndarray      # Category codes, in that order
+    dated: int                      # rows with a Publish Date (they come first)
+
+
+@lru_cache(maxsize=1)
+def _publish_order() -> _PublishOrder:
+    """
+    Sort once by Publish Date so any Publish Date window is one searchsorted
+    slice; the columns filters test are kept in the same order so a window
+    reads them as views.
+    """
+    publish = _dates("Publish Date")
+    order = np.argsort(publish, kind="stable")
+    return _PublishOrder(
+        order=order,
+        publish=publish[order],
+        end=_dates("End Date")[order],
+        category_codes=_codes("Category")[0][order],
+        dated=int(len(publish) - np.isnat(publish).sum()),
+    )
+
+
+@lru_cache(maxsize=1)
+def partitions() -> list[Partition]:
+    """
+    Split the publish-sorted order by Australian financial year of Publish Date
+    (FY2025 = Jul 2024 – Jun 2025), keeping each year's End Date range so
+    End Date windows can skip whole years. Ranges only; no rows are copied.
+    """
+    sorted_ = _publish_order()
+    publish, dated = sorted_.publish, sorted_.dated
+    when = pd.DatetimeIndex(publish[:dated])
+    fy = np.asarray(when.year + (when.month >= 7))
+
+    bounds = [0, *(int(i) + 1 for i in np.flatnonzero(np.diff(fy))), dated]
+    spans = [(f"FY{fy[a]}", a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+    if dated < len(publish):
+        spans.append(("unknown", dated, len(publish)))
+
+    parts = []
+    for key, a, b in spans:
+        ends = sorted_.end[a:b]
+        ends = ends[~np.isnat(ends)]
+        parts.append(Partition(
+            key=key,
+            start=a,
+            stop=b,
+            publish_min=pd.Timestamp(publish[a]),
+            publish_max=pd.Timestamp(publish[b - 1]),
+            end_min=pd.Timestamp(ends.min()) if len(ends) else pd.NaT,
+            end_max=pd.Timestamp(ends.max()) if len(ends) else pd.NaT,
+        ))
+    return parts
+
+
+def _bound(value) -> pd.Timestamp | None:
+    return None if value is None else pd.Timestamp(value)
+
+
+def _within(frame: pd.DataFrame, col: str, lo: pd.Timestamp | None, hi: pd.Timestamp | None) -> pd.DataFrame:
+    mask = pd.Series(True, index=frame.index)
+    if lo is not None:
+        mask &= frame[col] >= lo
+    if hi is not None:
+        mask &= frame[col] <= hi
+    return frame[mask]
+
+
+def _in_range(values: np.ndarray, lo: pd.Timestamp | None, hi: pd.Timestamp | None) -> np.ndarray:
+    """Boolean mask of datetime64 `values` inside [lo, hi]; NaT is never inside."""
+    mask = ~np.isnat(values)
+    if lo is not None:
+        mask &= values >= lo.to_datetime64()
+    if hi is not None:
+        mask &= values <= hi.to_datetime64()
+    return mask
+
+
+def _range_state(lo_stat, hi_stat, lo, hi) -> str | None:
+    """
+    Compare a partition's [lo_stat, hi_stat] to the query window [lo, hi]:
+    "skip" (no overlap), "all" (fully inside) or "mask" (straddles an edge).
+    """
+    if lo is None and hi is None:
+        return "all"
+    if pd.isna(lo_stat) or pd.isna(hi_stat):
+        return "skip"
+    if (lo is not None and hi_stat < lo) or (hi is not None and lo_stat > hi):
+        return "skip"
+    if (lo is None or lo_stat >= lo) and (hi is None or hi_stat <= hi):
+        return "all"
+    return "mask"
+
+
+def _filter(
+    df: pd.DataFrame,
+    categories: list[str],
+    since=None,
+    until=None,
+    ending_from=None,
+    ending_to=None,
+) -> pd.DataFrame:
+    """
+    Return rows whose Category is in the given list, optionally bounded by
+    Publish Date (since/until) and End Date (ending_from/ending_to).
+
+    On the full cached dataset a Publish Date window is a single searchsorted
+    slice of the publish-sorted order, financial years whose End Date range
+    misses the End Date window are dropped from it, and only the rows left
+    are checked against the category lookup and End Date. Rows come back in
+    dataset order.
+    """
+    since, until = _bound(since), _bound(until)
+    ending_from, ending_to = _bound(ending_from), _bound(ending_to)
+    full = df is load()
+    if since is None and until is None and ending_from is None and ending_to is None:
+        if full:
+            return df[_category_mask(_codes("Category")[0], categories)]
+        return df[df["Category"].isin(categories)]
+
+    if not full:
+        df = _within(df, "Publish Date", since, until)
+        df = _within(df, "End Date", ending_from, ending_to)
+        return df[df["Category"].isin(categories)]
+
+    ending = ending_from is not None or ending_to is not None
+    if since is None and until is None:
+        # No Publish Date window: one vectorised pass is cheaper than gathering slices
+        mask = _category_mask(_codes("Category")[0], categories)
+        return df[mask & _in_range(_dates("End Date"), ending_from, ending_to)]
+
+    sorted_ = _publish_order()
+    dated = sorted_.publish[:sorted_.dated]
+    lo = 0 if since is None else int(np.searchsorted(dated, since.to_datetime64(), "left"))
+    hi = len(dated) if until is None else int(np.searchsorted(dated, until.to_datetime64(), "right"))
+
+    spans = [(lo, hi)]
+    if ending:
+        spans = [
+            (max(lo, part.start), min(hi, part.stop))
+            for part in partitions()
+            if part.start < hi and part.stop > lo
+            and _range_state(part.end_min, part.end_max, ending_from, ending_to) != "skip"
+        ]
+
+    wanted = _category_lookup(categories)
+    pieces = []
+    for a, b in spans:
+        keep = wanted[sorted_.category_codes[a:b]]
+        if ending:
+            keep &= _in_range(sorted_.end[a:b], ending_from, ending_to)
+        pieces.append(sorted_.order[a:b][keep])
+    positions = np.concatenate(pieces) if pieces else sorted_.order[:0]
+    return df.iloc[np.sort(positions)]
+
+
+def select(
+    categories: list[str],
+    df: pd.DataFrame | None = None,
+    since=None,
+    until=None,
+) -> pd.DataFrame:
+    """Rows whose Category is in the given list (e.g. to keep as a session's working set)."""
+    if df is None:
+        df = load()
+    return _filter(df, categories, since, until)
+
+
+def select_positions(categories: list[str]) -> np.ndarray:
+    """
+    Positions in load() of rows whose Category is in the given list — a compact
+    working set to keep per chat; take the rows with load().iloc[positions].
+    """
+    return np.flatnonzero(_category_mask(_codes("Category")[0], categories))
+
+
+def names_at(positions: np.ndarray, column: str) -> frozenset[str]:
+    """Distinct non-missing `column` values among the load() rows at `positions`."""
+    codes, labels = _codes(column)
+    present = np.unique(codes[positions])
+    return frozenset(labels[present[present >= 0]])
+
+
+# Autocomplete kinds → dataset columns
+_NAME_COLUMNS = {"agency": "Agency", "supplier": "Supplier Name", "category": "Category"}
+
+
+@lru_cache(maxsize=1)
+def name_index() -> PrefixIndex:
+    """Prefix trie over distinct Agency / Supplier Name / Category values with their totals."""
+    df = load()
+    entries = []
+    for kind, col in _NAME_COLUMNS.items():
+        ranked = _top_k(df, col, top_n=len(df))
+        entries.extend(
+            (kind, str(name), total, count)
+            for name, total, count in ranked.itertuples(index=False)
+        )
+    return PrefixIndex(entries)
+
+
+def suggest(
+    prefix: str,
+    kinds: list[str] | None = None,
+    limit: int | None = 8,
+    where=None,
+) -> list[dict]:
+    """
+    Autocomplete agencies, suppliers and categories, highest total spend first.
+    `where(kind, name)` keeps only some names (see PrefixIndex.search).
+
+    Example:
+        suggest("dep def", kinds=["agency"])
+        → [{"kind": "agency", "name": "Department of Defence", "total_value": ..., ...}]
+    """
+    return name_index().search(prefix, kinds=kinds, limit=limit, where=where)
+
+
+def resolve_agency(name: str) -> list[str]:
+    """
+    Exact Agency values for a typed name: the exact (case-insensitive) match if
+    there is one, otherwise every agency whose words the input prefixes.
+    """
+    index = name_index()
+    exact = index.exact("agency", name)
+    if exact:
+        return [exact["name"]]
+    return [m["name"] for m in index.search(name, kinds=["agency"], limit=None)]
+
+
+def _isin(subset: pd.DataFrame, column: str, names: list[str]) -> pd.DataFrame:
+    """Rows whose `column` is one of `names`, matched on category codes when available."""
+    col = subset[column]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        wanted = col.cat.categories.get_indexer(names)
+        return subset[np.isin(col.cat.codes.to_numpy(), wanted[wanted >= 0])]
+    return subset[col.isin(names)]
 
 
 def spend_by_agency(
     categories: list[str],
     top_n: int = 8,
     df: pd.DataFrame | None = None,
+    since=None,
+    until=None,
 ) -> pd.DataFrame:
     """
     Total spend per agency for the given categories, sorted descending.
@@ -84,18 +430,11 @@ def spend_by_agency(
     if df is None:
         df = load()
 
-    subset = _filter(df, categories)
+    subset = _filter(df, categories, since, until)
     if subset.empty:
         return pd.DataFrame(columns=["Agency", "total_value", "contract_count"])
 
-    result = (
-        subset.groupby("Agency")
-        .agg(total_value=("Value", "sum"), contract_count=("CN ID", "count"))
-        .reset_index()
-        .sort_values("total_value", ascending=False)
-        .head(top_n)
-    )
-    return result
+    return _top_k(subset, "Agency", top_n)
 
 
 def top_suppliers(
@@ -103,36 +442,33 @@ def top_suppliers(
     agency: str | None = None,
     top_n: int = 5,
     df: pd.DataFrame | None = None,
+    since=None,
+    until=None,
 ) -> pd.DataFrame:
     """
     Top suppliers by total contract value for the given categories.
-    Optionally filter to a specific agency.
+    Optionally filter to a specific agency (resolved via resolve_agency()).
 
     Returns DataFrame with columns: Supplier Name, total_value, contract_count
     """
     if df is None:
         df = load()
 
-    subset = _filter(df, categories)
+    subset = _filter(df, categories, since, until)
     if agency:
-        subset = subset[subset["Agency"].str.contains(agency, case=False, na=False)]
+        subset = _isin(subset, "Agency", resolve_agency(agency))
     if subset.empty:
         return pd.DataFrame(columns=["Supplier Name", "total_value", "contract_count"])
 
-    result = (
-        subset.groupby("Supplier Name")
-        .agg(total_value=("Value", "sum"), contract_count=("CN ID", "count"))
-        .reset_index()
-        .sort_values("total_value", ascending=False)
-        .head(top_n)
-    )
-    return result
+    return _top_k(subset, "Supplier Name", top_n)
 
 
 def expiring_contracts(
     categories: list[str],
     months: int = 6,
     df: pd.DataFrame | None = None,
+    since=None,
+    until=None,
 ) -> pd.DataFrame:
     """
     Contracts in the given categories whose End Date falls within `months` from today.
@@ -143,13 +479,10 @@ def expiring_contracts(
     if df is None:
         df = load()
 
-    subset = _filter(df, categories)
     now = pd.Timestamp.now()
     cutoff = now + pd.DateOffset(months=months)
 
-    expiring = subset[
-        (subset["End Date"] >= now) & (subset["End Date"] <= cutoff)
-    ].copy()
+    expiring = _filter(df, categories, since, until, ending_from=now, ending_to=cutoff).copy()
 
     expiring = expiring.sort_values("End Date")
     return expiring[
@@ -157,7 +490,13 @@ def expiring_contracts(
     ]
 
 
-def category_summary(categories: list[str], df: pd.DataFrame | None = None) -> dict:
+def category_summary(
+    categories: list[str],
+    months: int = 6,
+    df: pd.DataFrame | None = None,
+    since=None,
+    until=None,
+) -> dict:
     """
     Return a single dict with all the key insight numbers for the given categories.
     This is what gets passed to the LLM to generate the 💰 section.
@@ -168,14 +507,14 @@ def category_summary(categories: list[str], df: pd.DataFrame | None = None) -> d
         contract_count          int
         top_agencies            list of dicts {agency, total_value, contract_count}
         top_suppliers           list of dicts {supplier, total_value, contract_count}
-        expiring_count          int — contracts expiring within 6 months
+        expiring_count          int — contracts expiring within `months`
         expiring_value          float — $ value of expiring contracts
         expiring_sample         list of dicts (up to 5 soonest)
     """
     if df is None:
         df = load()
 
-    subset = _filter(df, categories)
+    subset = _filter(df, categories, since, until)
 
     if subset.empty:
         return {
@@ -189,9 +528,10 @@ def category_summary(categories: list[str], df: pd.DataFrame | None = None) -> d
             "expiring_sample": [],
         }
 
-    agencies_df = spend_by_agency(categories, top_n=5, df=df)
-    suppliers_df = top_suppliers(categories, top_n=5, df=df)
-    expiring_df = expiring_contracts(categories, months=6, df=df)
+    # The bounded category subset is all the breakdowns need — scan it, not the full set
+    agencies_df = spend_by_agency(categories, top_n=5, df=subset)
+    suppliers_df = top_suppliers(categories, top_n=5, df=subset)
+    expiring_df = expiring_contracts(categories, months=months, df=subset)
 
     return {
         "matched_categories": categories,
@@ -0,0 +1,151 @@
+"""
+trawl/keywords.py — Local keyword extraction against the dataset's own vocabulary.
+
+Plain business descriptions don't need a Search-grounded Gemini call to get
+keywords: matching their words against category names and frequent contract
+Description terms is enough, and takes milliseconds. URLs and inputs with too
+few recognisable terms still go to Gemini.
+
+Public API:
+    ENGLISH_STOPWORDS   → common English words with no capability signal
+    vocabulary()        → cached term sets built from the dataset
+    is_url(text)        → True if the input looks like a URL / domain
+    extract(text)       → local profile dict, or None if Gemini should handle it
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from trawl import insights
+
+# Common English words that carry no capability signal
+ENGLISH_STOPWORDS = {
+    "about", "across", "also", "and", "are", "based", "both", "but", "can", "company",
+    "for", "from", "have", "help", "into", "its", "our", "ours", "over", "provide",
+    "provider", "providers", "providing", "small", "medium", "large", "specialise",
+    "specialising", "specialize", "specializing", "specialist", "specialists", "such",
+    "that", "the", "their", "them", "they", "this", "those", "through", "using", "very",
+    "we're", "were", "what", "which", "while", "who", "with", "work", "works", "your",
+    "business", "businesses", "clients", "client", "team", "teams", "experience",
+    "experienced", "offer", "offers", "range", "including", "other", "various", "all",
+    "any", "has", "had", "been", "being", "more", "most", "than", "then", "there",
+    "these", "will", "would", "years", "year", "within", "local",
+}
+
+_URL_RE = re.compile(
+    r"(https?://|www\.)|\b[a-z0-9-]+\.(?:com|net|org|gov|edu|io|co|biz)(?:\.au)?\b",
+    re.IGNORECASE,
+)
+_WORD_RE = re.compile(r"[a-z][a-z'-]{2,}")
+
+# Description terms must appear in at least this many contracts to count as vocabulary,
+# and in no more than this share of them (otherwise they're boilerplate).
+_MIN_DOC_FREQ = 5
+_MAX_DOC_SHARE = 0.2
+
+_MAX_KEYWORDS = 12
+
+
+@lru_cache(maxsize=1)
+def vocabulary() -> tuple[frozenset[str], frozenset[str]]:
+    """
+    Return (category_terms, description_terms) built from the loaded dataset.
+    Built once per process (≈1s on the full CSV).
+    """
+    df = insights.load()
+    stop = insights.STOPWORDS | ENGLISH_STOPWORDS
+
+    category_terms = {
+        word
+        for cat in df["Category"].dropna().unique()
+        for word in _WORD_RE.findall(cat.lower())
+        if len(word) > 3 and word not in stop
+    }
+
+    descriptions = df["Description"].dropna().astype(str).str.lower()
+    # Document frequency: count each term once per contract
+    terms = descriptions.str.findall(_WORD_RE.pattern).explode().dropna()
+    terms = terms[terms.str.len() > 3]
+    doc_freq = terms.reset_index().drop_duplicates().iloc[:, 1].value_counts()
+    max_docs = max(_MIN_DOC_FREQ, int(len(descriptions) * _MAX_DOC_SHARE))
+    description_terms = {
+        term for term, n in doc_freq.items()
+        if _MIN_DOC_FREQ <= n <= max_docs and term not in stop
+    }
+
+    return frozenset(category_terms), frozenset(description_terms)
+
+
+def is_url(text: str) -> bool:
+    return bool(_URL_RE.search(text))
+
+
+def _known(word: str, vocab: frozenset[str]) -> str | None:
+    """Return the vocabulary form of `word` (trying a naive singular), or None."""
+    if word in vocab:
+        return word
+    if word.endswith("s") and word[:-1] in vocab:
+        return word[:-1]
+    return None
+
+
+def extract(text: str) -> dict | None:
+    """
+    Build a profile locally. Returns None for URLs or when too little of the
+    input maps onto the dataset vocabulary — the caller should ask Gemini.
+
+    Confidence:
+        high    ≥2 category-name terms and ≥60% of content words recognised
+        medium  ≥1 category-name term and ≥40% recognised
+        low     anything else (→ None)
+    """
+    if not text.strip() or is_url(text):
+        return None
+
+    category_terms, description_terms = vocabulary()
+    stop = insights.STOPWORDS | ENGLISH_STOPWORDS
+
+    words = [w.strip("'-") for w in _WORD_RE.findall(text.lower())]
+
+    keywords: list[str] = []
+    content = 0
+    category_hits = 0
+    recognised = 0
+    prev: str | None = None
+    for word in words:
+        if len(word) <= 3 or word in stop:
+            prev = None
+            continue
+        content += 1
+        term = _known(word, category_terms)
+        if term:
+            category_hits += 1
+        else:
+            term = _known(word, description_terms)
+        if term:
+            recognised += 1
+            # Keep adjacent recognised words as a phrase too ("water quality")
+            if prev:
+                keywords.append(f"{prev} {term}")
+            keywords.append(term)
+        prev = term
+
+    if not content:
+        return None
+    coverage = recognised / content
+    if category_hits >= 2 and coverage >= 0.6:
+        confidence = "high"
+    elif category_hits >= 1 and coverage >= 0.4:
+        confidence = "medium"
+    else:
+        return None
+
+    return {
+        "summary": text.strip(),
+        "keywords": list(dict.fromkeys(keywords))[:_MAX_KEYWORDS],
+        "url": "",
+        "confidence": confidence,
+        "source": "local",
+    }
@@ -7,15 +7,27 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
+from datetime import date
 from functools import lru_cache
 
 from google import genai
 from google.genai import types
 
-from trawl import insights
+from trawl import insights, keywords, tenders
 
 MODEL_NAME = "gemini-2.5-flash"
 
+# Fall back to a Search-grounded Gemini call when the local open-tender index
+# (data/atm_open.csv) is missing or has no match. Set to 0 to stay fully local.
+TENDER_LLM_FALLBACK = os.getenv("TENDER_LLM_FALLBACK", "1") != "0"
+
+# Profiles are cached per normalized query so repeat questions skip the
+# grounded Gemini call. Failed / empty extractions are never cached.
+_PROFILE_CACHE_SIZE = 512
+_profile_cache: dict[str, dict] = {}
+_profile_lock = threading.Lock()
+
 
 @lru_cache(maxsize=1)
 def _client() -> genai.Client:
@@ -50,11 +62,22 @@ def _format_money(value: float) -> str:
     return f"${value:,.0f}"
 
 
+def normalize_query(user_input: str) -> str:
+    """Case-fold and collapse whitespace — the cache key for a query."""
+    return " ".join(user_input.split()).lower()
+
+
 def extract_profile(user_input: str) -> dict:
     """
     Extract a capability summary + keyword list.
-    If input is a URL, use Google Search to ground the summary.
+    Plain descriptions are matched locally against the dataset vocabulary;
+    URLs and low-confidence inputs go to Gemini, which uses Google Search to
+    ground URL summaries. The returned "source" is "local" or "gemini".
     """
+    local = keywords.extract(user_input)
+    if local is not None:
+        return local
+
     prompt = f"""
 You are TenderTrawl. Determine whether the input is a URL or a plain business description.
 
@@ -88,26 +111,86 @@ Input:
             "keywords": [],
             "url": "",
             "confidence": "low",
+            "source": "gemini",
         }
 
-    keywords = data.get("keywords")
-    if not isinstance(keywords, list):
-        keywords = []
+    kw_list = data.get("keywords")
+    if not isinstance(kw_list, list):
+        kw_list = []
 
     return {
         "summary": str(data.get("summary") or user_input.strip()),
-        "keywords": [str(k).strip() for k in keywords if str(k).strip()],
+        "keywords": [str(k).strip() for k in kw_list if str(k).strip()],
         "url": str(data.get("url") or "").strip(),
         "confidence": str(data.get("confidence") or "medium").strip().lower(),
+        "source": "gemini",
     }
 
 
+def profile_for(user_input: str) -> dict:
+    """extract_profile(), memoised per normalized query."""
+    key = normalize_query(user_input)
+    with _profile_lock:
+        cached = _profile_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    profile = extract_profile(user_input)
+    if profile["keywords"]:
+        with _profile_lock:
+            if len(_profile_cache) >= _PROFILE_CACHE_SIZE:
+                _profile_cache.pop(next(iter(_profile_cache)))
+            _profile_cache[key] = profile
+    return dict(profile)
+
+
+def cached_profile(user_input: str) -> dict | None:
+    """Return the cached profile for a query without calling Gemini."""
+    with _profile_lock:
+        cached = _profile_cache.get(normalize_query(user_input))
+    return dict(cached) if cached is not None else None
+
+
+def clear_caches(profiles: bool = False) -> None:
+    """
+    Drop every data-derived cache (call after a data refresh): the contracts
+    frame and its codes, dates, partitions and name index, the keyword vocabulary,
+    the open-tender index and rendered insights. Optionally drop profiles too.
+    """
+    insights.load.cache_clear()
+    insights._codes.cache_clear()
+    insights._dates.cache_clear()
+    insights._publish_order.cache_clear()
+    insights.partitions.cache_clear()
+    insights.name_index.cache_clear()
+    keywords.vocabulary.cache_clear()
+    tenders.load.cache_clear()
+    tenders.index.cache_clear()
+    _render_insights.cache_clear()
+    if profiles:
+        with _profile_lock:
+            _profile_cache.clear()
+
+
 def generate_tender_list(profile: dict, user_input: str) -> str:
     """
-    Use Google Search to produce a short list of open tenders.
+    Produce a short list of open tenders: from the local ATM index when it has
+    matches, otherwise (if TENDER_LLM_FALLBACK) via Google Search grounding.
     """
-    keywords = profile.get("keywords", [])
-    keyword_text = ", ".join(keywords[:8]) if keywords else user_input
+    kw_list = profile.get("keywords", [])
+
+    local = tenders.tender_markdown(kw_list)
+    if local:
+        return local
+    if not TENDER_LLM_FALLBACK:
+        if tenders.available():
+            return (
+                "🎣 No open tenders in the current feed match those capabilities. "
+                "Try describing your services a bit more broadly."
+            )
+        return ""
+
+    keyword_text = ", ".join(kw_list[:8]) if kw_list else user_input
 
     prompt = f"""
 Use Google Search to find up to 3 open Australian Government tenders relevant to:
@@ -147,10 +230,26 @@ If you cannot find tenders, say so directly and suggest the user provide more de
     return (getattr(response, "text", "") or "").strip()
 
 
-def insights_markdown(keywords: list[str]) -> str:
-    categories = insights.match_categories(keywords)
-    summary = insights.category_summary(categories)
+def insights_markdown(kw_list: list[str]) -> str:
+    categories = insights.match_categories(kw_list)
+    return _render_insights(tuple(categories), date.today().isoformat())
 
+
+@lru_cache(maxsize=256)
+def _render_insights(categories: tuple[str, ...], today: str) -> str:
+    """
+    Render the 💰 block for a category set. Keyed on the date as well, since
+    the expiring-contracts window moves with it.
+    """
+    categories = list(categories)
+    return format_insights(categories, insights.category_summary(categories))
+
+
+def format_insights(categories: list[str], summary: dict, months: int = 6, scope: str = "") -> str:
+    """
+    Format a category_summary() dict as the 💰 markdown block.
+    `scope` is an optional line describing any extra filters applied.
+    """
     if not categories or summary["contract_count"] == 0:
         return (
             "💰 **Historical spend insights**\n\n"
@@ -164,6 +263,10 @@ def insights_markdown(keywords: list[str]) -> str:
         "Looking at historical spend across your categories "
         f"*({', '.join(categories[:6])})* over the dataset:",
         "",
+    ]
+    if scope:
+        lines.extend([f"*{scope}*", ""])
+    lines += [
         "| Agency | Spend | Contracts |",
         "|---|---|---|",
     ]
@@ -181,10 +284,13 @@ def insights_markdown(keywords: list[str]) -> str:
         lines.extend(["", f"**Top winners:** {winners}"])
 
     expiring_value = _format_money(summary["expiring_value"])
+    count = summary["expiring_count"]
+    window = f"{months} months" if months != 1 else "month"
     lines.extend(
         [
             "",
-            f"**{summary['expiring_count']:,} contracts worth {expiring_value} expire in the next 6 months.**",
+            f"**{count:,} contract{'s' if count != 1 else ''} worth {expiring_value} "
+            f"expire{'s' if count == 1 else ''} in the next {window}.**",
         ]
     )
 
@@ -196,7 +302,7 @@ def generate_response(user_input: str) -> tuple[str, bool]:
     Returns (response_markdown, has_tenders).
     has_tenders is True when at least one open tender was found.
     """
-    profile = extract_profile(user_input)
+    profile = profile_for(user_input)
     tender_block = generate_tender_list(profile, user_input)
     insight_block = insights_markdown(profile.get("keywords", []))
 
@@ -0,0 +1,262 @@
+"""
+trawl/session.py — Per-chat state for incremental follow-up turns.
+
+The first turn (or any turn that describes a new business) runs the full
+Gemini pipeline and keeps the profile, matched categories and the positions
+of their rows in the shared dataset (not a copy of the rows).
+Follow-ups that only narrow by agency, supplier or time window — "just
+Defence", "what about the next 12 months?", "FY25 only" — are answered by
+filtering those cached rows locally, with no LLM call.
+
+Public API:
+    Session                       → state object (keep one per chat, e.g. in gr.State)
+    Session.refinement(message)   → parsed Refinement, or None if it needs the LLM
+    Session.suggest(prefix)       → agency/supplier autocomplete within the current rows
+    Session.answer(message)       → (markdown, has_tenders, path)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from trawl import insights, llm
+
+# Filler words in follow-ups that say nothing about which agency/supplier is meant
+_FILLER = {
+    "just", "only", "what", "whats", "about", "how", "show", "me", "the", "for", "at",
+    "in", "on", "of", "and", "with", "by", "from", "to", "a", "an", "please", "instead",
+    "now", "then", "same", "but", "filter", "narrow", "limit", "contracts", "contract",
+    "spend", "spending", "agency", "agencies", "department", "dept", "supplier",
+    "suppliers", "who", "is", "are", "was", "were", "winning", "won", "there", "any",
+    "that", "those", "these", "it", "them", "within", "over", "during", "all",
+    "expiring", "expire", "published", "ok", "okay", "thanks", "can", "you", "i", "we",
+}
+
+_NEXT_RE = re.compile(r"\b(?:next|coming)\s+(\d+)\s+(month|year)s?\b")
+_NEXT_YEAR_RE = re.compile(r"\b(?:next|coming)\s+(month|year)\b")
+_PAST_RE = re.compile(r"\b(?:last|past|previous)\s+(\d+)\s+(month|year)s?\b")
+_PAST_YEAR_RE = re.compile(r"\b(?:last|past|previous)\s+(month|year)\b")
+_FY_RE = re.compile(r"\bfy\s?(?:20)?(\d{2})\b")
+_RESET_RE = re.compile(r"\b(?:all|every|any)\s+(agenc(?:y|ies)|suppliers?|time|dates?)\b")
+
+# Longer messages are new business descriptions, not follow-ups
+_MAX_FOLLOWUP_WORDS = 12
+
+# Supplier narrowing needs one of these (or an exact name): a short capability
+# description ("cleaning services") can prefix-match supplier names too
+_SUPPLIER_CUES = {"just", "only", "by", "supplier", "suppliers"}
+
+_NAME_COLUMNS = {"agency": "Agency", "supplier": "Supplier Name"}
+
+
+@dataclass
+class Refinement:
+    """Filters parsed from a follow-up. None means "leave as is"."""
+    agencies: list[str] | None = None
+    suppliers: list[str] | None = None
+    since: pd.Timestamp | None = None
+    until: pd.Timestamp | None = None
+    months: int | None = None
+    reset: set[str] = field(default_factory=set)
+
+
+@dataclass
+class Session:
+    profile: dict | None = None
+    categories: list[str] = field(default_factory=list)
+    positions: np.ndarray | None = None       # load() positions of contracts in `categories`
+    names: dict[str, frozenset[str]] | None = None  # agency/supplier names at `positions`
+    has_tenders: bool = False
+    agencies: list[str] | None = None
+    suppliers: list[str] | None = None
+    since: pd.Timestamp | None = None
+    until: pd.Timestamp | None = None
+    months: int = 6
+
+    @property
+    def rows(self) -> pd.DataFrame | None:
+        """Contracts in `categories`, taken from the shared dataset on demand."""
+        if self.positions is None:
+            return None
+        return insights.load().iloc[self.positions]
+
+    def _names(self, kind: str) -> frozenset[str]:
+        """Names of `kind` with contracts in the current selection, built once per selection."""
+        if self.names is None:
+            self.names = {k: insights.names_at(self.positions, col) for k, col in _NAME_COLUMNS.items()}
+        return self.names[kind]
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def refinement(self, message: str) -> Refinement | None:
+        """
+        Parse `message` as a narrowing follow-up on the current selection.
+        Returns None when there is no selection yet or the message reads like
+        a new capability description.
+        """
+        if self.positions is None or not self.categories:
+            return None
+
+        text = message.lower()
+        if len(text.split()) > _MAX_FOLLOWUP_WORDS:
+            return None
+
+        # A full agency/supplier name (e.g. picked from autocomplete) means exactly that one,
+        # even if it has no contracts in these categories (_render says so)
+        index = insights.name_index()
+        for kind in _NAME_COLUMNS:
+            exact = index.exact(kind, message)
+            if exact:
+                return Refinement(**{"agencies" if kind == "agency" else "suppliers": [exact["name"]]})
+
+        ref = Refinement()
+        now = pd.Timestamp.now().normalize()
+
+        if m := _NEXT_RE.search(text):
+            n, unit = int(m.group(1)), m.group(2)
+            ref.months = n * 12 if unit == "year" else n
+            text = text.replace(m.group(0), " ")
+        elif m := _NEXT_YEAR_RE.search(text):
+            ref.months = 12 if m.group(1) == "year" else 1
+            text = text.replace(m.group(0), " ")
+
+        if m := _PAST_RE.search(text):
+            n, unit = int(m.group(1)), m.group(2)
+            ref.since = now - pd.DateOffset(months=n * 12 if unit == "year" else n)
+            text = text.replace(m.group(0), " ")
+        elif m := _PAST_YEAR_RE.search(text):
+            ref.since = now - pd.DateOffset(months=12 if m.group(1) == "year" else 1)
+            text = text.replace(m.group(0), " ")
+        elif m := _FY_RE.search(text):
+            # Australian financial year: FY25 = 1 Jul 2024 – 30 Jun 2025
+            end_year = 2000 + int(m.group(1))
+            ref.since = pd.Timestamp(end_year - 1, 7, 1)
+            ref.until = pd.Timestamp(end_year, 6, 30, 23, 59, 59)
+            text = text.replace(m.group(0), " ")
+
+        for m in _RESET_RE.finditer(text):
+            word = m.group(1)
+            ref.reset.add("agency" if word.startswith("agenc") else
+                          "supplier" if word.startswith("supplier") else "time")
+            text = text.replace(m.group(0), " ")
+
+        words = re.findall(r"[a-z0-9&]+", text)
+        tokens = [t for t in words if len(t) > 1 and t not in _FILLER]
+        if tokens:
+            agencies = _match_names(self._names("agency"), "agency", tokens)
+            if agencies:
+                ref.agencies = agencies
+            else:
+                if _SUPPLIER_CUES.isdisjoint(words):
+                    return None
+                suppliers = _match_names(self._names("supplier"), "supplier", tokens)
+                if not suppliers:
+                    return None
+                ref.suppliers = suppliers
+
+        if (ref.agencies is None and ref.suppliers is None and ref.since is None
+                and ref.months is None and not ref.reset):
+            return None
+        return ref
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Agency/supplier names for autocomplete, highest spend first. Once there
+        is a selection, only names with contracts in it are offered.
+        """
+        # Filtered inside the index, in rank order, so the scan stops at `limit`
+        where = (lambda kind, name: name in self._names(kind)) if self.positions is not None else None
+        matches = insights.suggest(prefix, kinds=list(_NAME_COLUMNS), limit=limit, where=where)
+        return [m["name"] for m in matches]
+
+    # ------------------------------------------------------------------
+    # Answering
+    # ------------------------------------------------------------------
+
+    def answer(self, message: str, refinement: Refinement | None = None) -> tuple[str, bool, str]:
+        """
+        Returns (response_markdown, has_tenders, path), where path is
+        "refine" for a local answer or "llm" for the full pipeline. Refine
+        answers carry no tender block, so their has_tenders is False.
+        Pass a `refinement` already obtained from refinement() to skip re-parsing.
+        """
+        if refinement is None:
+            refinement = self.refinement(message)
+        if refinement is not None:
+            self._apply(refinement)
+            return self._render(), False, "refine"
+
+        full_response, has_tenders = llm.generate_response(message)
+        self.profile = llm.cached_profile(message)
+        keywords = (self.profile or {}).get("keywords", [])
+        self.categories = insights.match_categories(keywords) if keywords else []
+        self.positions = insights.select_positions(self.categories) if self.categories else None
+        self.names = None
+        if self.positions is not None:
+            self._names("agency")  # build once here, not on the first keystroke
+        self.has_tenders = has_tenders
+        self.agencies = self.suppliers = self.since = self.until = None
+        self.months = 6
+        return full_response, has_tenders, "llm"
+
+    def _apply(self, ref: Refinement) -> None:
+        if "agency" in ref.reset:
+            self.agencies = None
+        if "supplier" in ref.reset:
+            self.suppliers = None
+        if "time" in ref.reset:
+            self.since = self.until = None
+            self.months = 6
+        if ref.agencies is not None:
+            self.agencies = ref.agencies
+        if ref.suppliers is not None:
+            self.suppliers = ref.suppliers
+        if ref.since is not None:
+            self.since, self.until = ref.since, ref.until
+        if ref.months is not None:
+            self.months = ref.months
+
+    def _render(self) -> str:
+        rows = self.rows
+        scope = []
+        if self.agencies:
+            rows = rows[rows["Agency"].isin(self.agencies)]
+            scope.append(" / ".join(self.agencies[:3]) + (" …" if len(self.agencies) > 3 else ""))
+        if self.suppliers:
+            rows = rows[rows["Supplier Name"].isin(self.suppliers)]
+            scope.append("supplier " + " / ".join(self.suppliers[:3]))
+        if self.since is not None:
+            scope.append(f"published from {self.since:%d %b %Y}")
+        if self.until is not None:
+            scope.append(f"to {self.until:%d %b %Y}")
+
+        summary = insights.category_summary(
+            self.categories, months=self.months, df=rows, since=self.since, until=self.until,
+        )
+        if summary["contract_count"] == 0 and scope:
+            return (
+                "💰 **Historical spend insights**\n\n"
+                f"No contracts for {' · '.join(scope)} in your categories "
+                f"*({', '.join(self.categories[:6])})*. "
+                "Try another agency or supplier, or say \"all agencies\" to widen it again."
+            )
+        scope_line = "Filtered to: " + " · ".join(scope) if scope else ""
+        return llm.format_insights(self.categories, summary, months=self.months, scope=scope_line)
+
+
+def _match_names(present: frozenset[str], kind: str, tokens: list[str]) -> list[str]:
+    """
+    Names of `kind` in `present` where every token prefixes one of the name's
+    words (so "defence" → "Department of Defence", "Defence Housing Australia").
+    Looked up in the autocomplete index rather than scanning every name.
+    """
+    matches = insights.suggest(
+        " ".join(tokens), kinds=[kind], limit=None, where=lambda _, name: name in present,
+    )
+    return sorted(m["name"] for m in matches)
@@ -0,0 +1,172 @@
+"""
+trawl/tenders.py — Local index over open AusTender Approach to Market (ATM) notices.
+
+Built from data/atm_open.csv (see scripts/combine_atm_exports.py). Keywords are
+matched in-process against an inverted index of title / category / description
+tokens, so finding open tenders no longer needs a Search-grounded LLM call.
+
+Public API:
+    load()                      → load + cache the open-tender CSV (empty if absent)
+    available()                 → True if there is an index to search
+    index()                     → cached inverted index (token → rows) + IDF
+    search(keywords, top_n)     → best-matching still-open tenders
+    tender_markdown(keywords)   → 🎣 block in the same format as the LLM path, or ""
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+from urllib.parse import quote_plus
+
+import pandas as pd
+
+from trawl.insights import STOPWORDS
+from trawl.keywords import ENGLISH_STOPWORDS
+
+_ATM_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "atm_open.csv")
+_SEARCH_URL = "https://www.tenders.gov.au/Search/KeywordSearch?keyword={}"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]{3,}")
+
+# Title hits count for more than description hits
+_FIELD_WEIGHTS = {"Title": 2.0, "Category": 1.5, "Agency": 0.5, "Description": 1.0}
+
+# A local result must match at least this share of the query weight (on title,
+# category or description, not just the agency); otherwise the caller falls back to Gemini
+_MIN_SCORE = 0.15
+
+_STOP = STOPWORDS | ENGLISH_STOPWORDS
+
+
+@lru_cache(maxsize=1)
+def load() -> pd.DataFrame:
+    """Load atm_open.csv once and cache in-process. Empty frame if not built yet."""
+    if not os.path.exists(_ATM_PATH):
+        return pd.DataFrame(columns=["ATM ID", "Title", "Agency", "Close Date"])
+    df = pd.read_csv(_ATM_PATH, dtype=str, keep_default_na=False)
+    df["Close Date"] = pd.to_datetime(df["Close Date"], errors="coerce")
+    return df.reset_index(drop=True)
+
+
+def _tokens(text: str) -> set[str]:
+    return {t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP}
+
+
+@lru_cache(maxsize=1)
+def index() -> tuple[dict[str, dict[int, float]], dict[str, float]]:
+    """
+    Inverted index: token → {row: field weight}, plus per-token IDF.
+    Built once per process from load().
+    """
+    df = load()
+    postings: dict[str, dict[int, float]] = defaultdict(dict)
+    for field, weight in _FIELD_WEIGHTS.items():
+        if field not in df.columns:
+            continue
+        for row, text in enumerate(df[field].fillna("")):
+            for tok in _tokens(text):
+                if postings[tok].get(row, 0) < weight:
+                    postings[tok][row] = weight
+
+    n = max(len(df), 1)
+    idf = {tok: math.log(1 + n / len(rows)) for tok, rows in postings.items()}
+    return dict(postings), idf
+
+
+def available() -> bool:
+    return not load().empty
+
+
+def search(keywords: list[str], top_n: int = 3) -> pd.DataFrame:
+    """
+    Score open tenders by IDF-weighted keyword token hits (title > category >
+    description > agency). Only tenders whose Close Date is still ahead are
+    returned. Adds `score` (0–1, share of query weight matched) to the result.
+
+    Query tokens missing from the index still count towards the total weight,
+    agency-name hits alone never qualify a tender, and results scoring below
+    _MIN_SCORE are dropped.
+    """
+    df = load()
+    if df.empty or not keywords:
+        return df.head(0).assign(score=pd.Series(dtype=float))
+
+    postings, idf = index()
+    query = set()
+    for kw in keywords:
+        query |= _tokens(kw)
+    if not query:
+        return df.head(0).assign(score=pd.Series(dtype=float))
+
+    scores: dict[int, float] = defaultdict(float)
+    content: set[int] = set()
+    for tok in query & idf.keys():
+        for row, weight in postings[tok].items():
+            scores[row] += idf[tok] * weight
+            if weight > _FIELD_WEIGHTS["Agency"]:
+                content.add(row)
+
+    # Unseen tokens weigh as much as a token that appears in a single tender
+    unseen_idf = math.log(1 + max(len(df), 1))
+    max_possible = sum(idf.get(t, unseen_idf) for t in query) * max(_FIELD_WEIGHTS.values())
+    now = pd.Timestamp.now()
+    ranked = sorted(scores.items(), key=lambda kv: -kv[1])
+
+    hits = []
+    for row, score in ranked:
+        if score / max_possible < _MIN_SCORE:
+            break
+        if row not in content:
+            continue
+        close = df.at[row, "Close Date"]
+        if pd.isna(close) or close < now:
+            continue
+        hits.append((row, score / max_possible))
+        if len(hits) >= top_n:
+            break
+
+    if not hits:
+        return df.head(0).assign(score=pd.Series(dtype=float))
+    rows, rel = zip(*hits)
+    return df.iloc[list(rows)].assign(score=list(rel))
+
+
+def _link(row: pd.Series) -> str:
+    url = str(row.get("URL") or "").strip()
+    return url or _SEARCH_URL.format(quote_plus(str(row["ATM ID"])))
+
+
+def tender_markdown(keywords: list[str], top_n: int = 3) -> str:
+    """
+    Render the best local matches in the same Markdown shape the LLM path
+    returns. Empty string when there is no index or nothing matches well enough.
+    """
+    matches = search(keywords, top_n=top_n)
+    if matches.empty:
+        return ""
+
+    count = len(matches)
+    lines = [
+        f"🎣 Found **{count} open tender{'s' if count != 1 else ''}** "
+        f"that match{'es' if count == 1 else ''} your capabilities:",
+        "",
+        "---",
+    ]
+    for _, row in matches.iterrows():
+        emoji = "🎯" if row["score"] >= 0.35 else "⚡"
+        agency = str(row.get("Agency") or "").strip()
+        title = f"{row['Title']} — {agency}" if agency else row["Title"]
+        fit = str(row.get("Category") or "").strip()
+        lines.extend([
+            "",
+            f"{emoji} **[{title}]({_link(row)})**",
+            f"Closes **{row['Close Date']:%d %b %Y}**",
+        ])
+        if fit:
+            lines.append(f"*{fit}*")
+
+    return "\n".join(lines)
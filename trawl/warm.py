@@ -0,0 +1,147 @@
+"""
+trawl/warm.py — Pre-fill the in-process caches from the query log.
+
+Reads tendertrawl_logs.jsonl, ranks the most frequent normalized queries and
+keyword sets, and renders their insight blocks so the top of the distribution
+is served hot from the first request after a deploy or data refresh.
+
+Public API:
+    read_queries(log_path)              → logged `query` events
+    rank_queries(events)                → [(normalized query, count), ...]
+    rank_keyword_sets(events)           → [(keyword tuple, count), ...]
+    warm(log_path, ...)                 → run one warm-up pass, return stats
+    start(log_path, ..., interval=...)  → warm in a background thread
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import traceback
+from collections import Counter
+
+from trawl import insights, keywords, llm, tenders
+
+
+def read_queries(log_path: str) -> list[dict]:
+    """Return all `query` events from the JSONL log (missing file → [])."""
+    if not log_path or not os.path.exists(log_path):
+        return []
+    events = []
+    with open(log_path) as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("event") == "query" and event.get("query"):
+                events.append(event)
+    return events
+
+
+def rank_queries(events: list[dict]) -> list[tuple[str, int]]:
+    """
+    Most frequent normalized queries, most common first. Local follow-ups
+    (path "refine", e.g. "just defence") aren't business descriptions and
+    are left out.
+    """
+    return Counter(
+        llm.normalize_query(e["query"]) for e in events if e.get("path") != "refine"
+    ).most_common()
+
+
+def rank_keyword_sets(events: list[dict]) -> list[tuple[tuple[str, ...], int]]:
+    """
+    Most frequent keyword sets, most common first. Different queries that
+    extract to the same keywords count together.
+    """
+    counts: Counter = Counter()
+    for e in events:
+        kw_list = e.get("keywords")
+        if isinstance(kw_list, list) and kw_list:
+            counts[tuple(sorted({str(k).strip().lower() for k in kw_list}))] += 1
+    return counts.most_common()
+
+
+def warm(
+    log_path: str,
+    top_n: int = 20,
+    seed_queries: list[str] | tuple[str, ...] = (),
+    fetch_profiles: int = 0,
+) -> dict:
+    """
+    One warm-up pass.
+
+    - Renders insights for the `top_n` most frequent logged keyword sets
+      (pure pandas, no LLM).
+    - Fetches profiles for every one of `seed_queries` plus the
+      `fetch_profiles` most frequent logged queries (cached per query;
+      Gemini only for URLs and descriptions the local extractor can't
+      handle) and renders their insights too.
+
+    Returns counts of what was warmed.
+    """
+    started = time.perf_counter()
+    insights.load()
+    insights.partitions()
+    insights.name_index()
+    keywords.vocabulary()  # local profile extraction
+    tenders.index()
+
+    events = read_queries(log_path)
+    keyword_sets = rank_keyword_sets(events)[:top_n]
+    for keyword_set, _ in keyword_sets:
+        llm.insights_markdown(list(keyword_set))
+
+    # Seeds have their own budget, so logged queries still get `fetch_profiles` fetches
+    seeds = list(dict.fromkeys(llm.normalize_query(q) for q in seed_queries))
+    logged = [q for q, _ in rank_queries(events) if q not in seeds][:fetch_profiles]
+
+    profiles = 0
+    for query in seeds + logged:
+        try:
+            profile = llm.profile_for(query)
+        except Exception as e:
+            print(f"⚠️  warm: profile fetch failed for {query!r}: {e}", flush=True)
+            continue
+        llm.insights_markdown(profile.get("keywords", []))
+        profiles += 1
+
+    return {
+        "events": len(events),
+        "keyword_sets": len(keyword_sets),
+        "profiles": profiles,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def start(
+    log_path: str,
+    top_n: int = 20,
+    seed_queries: list[str] | tuple[str, ...] = (),
+    fetch_profiles: int = 0,
+    interval: float | None = None,
+) -> threading.Thread:
+    """
+    Run warm() in a daemon thread so startup isn't blocked. With `interval`
+    (seconds), keep re-warming on that schedule to follow shifting traffic.
+    """
+    def _loop() -> None:
+        while True:
+            try:
+                stats = warm(log_path, top_n=top_n, seed_queries=seed_queries,
+                             fetch_profiles=fetch_profiles)
+                print(f"🔥 warm: {stats['keyword_sets']} keyword sets, {stats['profiles']} profiles "
+                      f"from {stats['events']} logged queries in {stats['seconds']}s", flush=True)
+            except Exception:
+                print("⚠️  warm: pass failed", flush=True)
+                traceback.print_exc()
+            if not interval:
+                return
+            time.sleep(interval)
+
+    thread = threading.Thread(target=_loop, name="tendertrawl-warm", daemon=True)
+    thread.start()
+    return thread